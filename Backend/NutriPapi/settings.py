@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
 from pathlib import Path
+import sys
 
 # Encryption settings
 ENCRYPTION_KEY = 'Lz4Eq7GMWoFcisQbrY8bkQE6sGt7-lyV8OET-wmoeck='
@@ -82,6 +83,9 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'TEST': {
+            'NAME': ':memory:',
+        },
     }
 }
 
@@ -103,6 +107,15 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Test settings
+# Use a fast (insecure) password hasher and skip password validation when running the unit test suite
+
+if len(sys.argv) > 1 and sys.argv[1] == 'test':
+    PASSWORD_HASHERS = [
+        'django.contrib.auth.hashers.MD5PasswordHasher',
+    ]
+    AUTH_PASSWORD_VALIDATORS = []
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.0/topics/i18n/
 
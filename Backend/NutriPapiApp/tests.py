@@ -1,50 +1,104 @@
 from datetime import timedelta
 from django.utils import timezone
-from django.test import TestCase
+from importlib import import_module
+from django.conf import settings
+from django.db.models import Exists
+from django.test import TestCase, RequestFactory
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from .models import Ingredient, Fridge, Recipe, Schedule
+from .views import signin_view, sign_out_view, change_password
 from unittest.mock import patch
 import pytz
 import json
 
 User = get_user_model()
 
-class UserTests(TestCase):
+def _json_body(data):
+    """Encode a request body to bytes so the test client can send it as-is."""
+    return json.dumps(data).encode()
+
+# Request bodies that never change between tests are serialized once at import
+_SIGNUP_BODY = _json_body({
+    'username': 'newuser',
+    'email': 'new@example.com',
+    'password': 'newpassword123'
+})
+_SIGNUP_FOLLOW_BODY = _json_body({
+    'target_weight': 70.0,
+    'current_weight': 75.0,
+    'height': 180,
+    'weekly_physical_activity': 3,
+    'gender': 'M',
+    'dietary_restriction': 'None',
+    'first_name': 'New',
+    'birthday': '2000-01-01'
+})
+_SIGNIN_BODY = _json_body({
+    'username': 'testuser',
+    'password': 'password123'
+})
+_CHANGE_PASSWORD_BODY = _json_body({'new_password': 'newpassword123'})
+_DELETE_ACCOUNT_BODY = _json_body({'password': 'password123'})
+_TOMATO_INGREDIENTS_BODY = _json_body({'ingredients': ['Tomato']})
+_NO_INGREDIENTS_BODY = _json_body({'ingredients': []})
+_HEALTH_PROFILE_BODY = _json_body({
+    'current_weight': 70,
+    'target_weight': 75,
+    'height': 170,
+    'weekly_physical_activity': 3,
+    'gender': 'male',
+    'dietary_restriction': 'none',
+    'birthday': '1990-01-01'
+})
+
+class LoggedInUserMixin:
+    """Create a test user once per class and log them in before each test."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('testuser', 'test@example.com', 'password123')
+
     def setUp(self):
-        """Create a user and log them in for testing."""
-        self.base_url = reverse('signup')
-        self.user = User.objects.create_user('testuser', 'test@example.com', 'password123')
+        super().setUp()
         self.client.login(username='testuser', password='password123')
 
+class UserTests(LoggedInUserMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """Create the test user and resolve the account endpoint URLs."""
+        super().setUpTestData()
+        cls.signup_url = reverse('signup')
+        cls.signup_follow_url = reverse('signup_follow')
+        cls.signin_url = reverse('signin')
+        cls.sign_out_url = reverse('signout')
+        cls.get_user_info_url = reverse('get_user_info')
+        cls.change_password_url = reverse('change_password')
+        cls.delete_account_url = reverse('delete_account')
+        cls.rf = RequestFactory()
+
+    def view_request(self, url, body=None):
+        """Build a POST for calling a view directly, bypassing the middleware stack."""
+        request = self.rf.post(url, body, content_type="application/json")
+        request.session = import_module(settings.SESSION_ENGINE).SessionStore()
+        request.user = self.user
+        return request
+
     def test_signup_view(self):
         """Test the signup view for creating a new user."""
-        data = {
-            'username': 'newuser',
-            'email': 'new@example.com',
-            'password': 'newpassword123'
-        }
-        response = self.client.post(self.base_url, json.dumps(data), content_type="application/json")
+        response = self.client.post(self.signup_url, _SIGNUP_BODY, content_type="application/json")
         self.assertEqual(response.status_code, 201)
         self.assertTrue(User.objects.filter(username='newuser').exists())
 
     def test_signup_follow(self):
         """Test that a user can submit additional profile information after signup."""
-        signup_follow_url = reverse('signup_follow')
-        follow_data = {
-            'target_weight': 70.0,
-            'current_weight': 75.0,
-            'height': 180,
-            'weekly_physical_activity': 3,
-            'gender': 'M',
-            'dietary_restriction': 'None',
-            'first_name': 'New',
-            'birthday': '2000-01-01'
-        }
-        response = self.client.post(signup_follow_url, json.dumps(follow_data), content_type="application/json")
+        response = self.client.post(self.signup_follow_url, _SIGNUP_FOLLOW_BODY, content_type="application/json")
         self.assertEqual(response.status_code, 200)
 
-        user = User.objects.get(username='testuser')
+        user = User.objects.only(
+            'target_weight', 'current_weight', 'height', 'weekly_physical_activity',
+            'gender', 'dietary_restriction', 'first_name', 'birthday'
+        ).get(username='testuser')
         self.assertEqual(user.target_weight, 70.0)
         self.assertEqual(user.current_weight, 75.0)
         self.assertEqual(user.height, 180)
@@ -56,18 +110,12 @@ class UserTests(TestCase):
 
     def test_signin_view(self):
         """Test the signin view for authenticating a user."""
-        url = reverse('signin')
-        data = {
-            'username': 'testuser',
-            'password': 'password123'
-        }
-        response = self.client.post(url, json.dumps(data), content_type="application/json")
+        response = signin_view(self.view_request(self.signin_url, _SIGNIN_BODY))
         self.assertEqual(response.status_code, 200)
 
     def test_sign_out_view(self):
         """Test the sign out view logs a user out."""
-        sign_out_url = reverse('signout')
-        response = self.client.post(sign_out_url)
+        response = sign_out_view(self.view_request(self.sign_out_url))
         self.assertEqual(response.status_code, 200)
 
     def test_get_user_info(self):
@@ -80,9 +128,8 @@ class UserTests(TestCase):
         self.user.weekly_physical_activity = 5
         self.user.save()
 
-        url = reverse('get_user_info')
-        response = self.client.get(url)
-        data = json.loads(response.content)
+        response = self.client.get(self.get_user_info_url)
+        data = response.json()
         
         self.assertEqual(response.status_code, 200)
         self.assertEqual(data['username'], 'testuser')
@@ -96,9 +143,7 @@ class UserTests(TestCase):
 
     def test_change_password(self):
         """Test changing the user's password."""
-        url = reverse('change_password')
-        data = {'new_password': 'newpassword123'}
-        response = self.client.post(url, json.dumps(data), content_type="application/json")
+        response = change_password(self.view_request(self.change_password_url, _CHANGE_PASSWORD_BODY))
         
         self.assertEqual(response.status_code, 200)
         self.assertTrue(User.objects.filter(username='testuser').exists())
@@ -106,10 +151,6 @@ class UserTests(TestCase):
 
     def test_account_deletion(self):
         """Test that deleting a user account removes all associated personal information."""
-        url = reverse('change_password')
-        data = {'new_password': 'password123'}
-        response = self.client.post(url, json.dumps(data), content_type="application/json")
-
         fridge = Fridge.objects.create(user=self.user)
         ingredient = Ingredient.objects.create(name='Tomato')
         fridge.ingredients.add(ingredient)
@@ -119,36 +160,43 @@ class UserTests(TestCase):
         schedule.recipes.add(recipe)
 
         # Delete the user account
-        url = reverse('delete_account')
-        data = {'password': data.get('new_password')}
-        response = self.client.delete(url, json.dumps(data), content_type="application/json")
+        response = self.client.delete(self.delete_account_url, _DELETE_ACCOUNT_BODY, content_type="application/json")
 
         # Verify the user and all related data are deleted
         self.assertEqual(response.status_code, 200) # Check error code for successful deletion       
-        self.assertFalse(User.objects.filter(username='testuser').exists()) # Check if user is deleted
-        self.assertFalse(Fridge.objects.filter(user=self.user).exists()) # Check if fridge is deleted
-        self.assertTrue(Ingredient.objects.filter(name='Tomato').exists())  # Check if ingredient still exists
-        self.assertTrue(Recipe.objects.filter(name='Tomato Salad').exists())  # Check if recipe still exists
-        self.assertFalse(Schedule.objects.filter(user=self.user).exists()) # Check if schedule is deleted
 
-class FridgeIngredientTests(TestCase):
-    def setUp(self):
-        """Create a user and log them in for testing."""
-        self.user = User.objects.create_user('testuser', 'test@example.com', 'password123')
-        self.client.login(username='testuser', password='password123')
- 
+        # Fetch every existence check in one query, anchored on the ingredient row
+        remaining = Ingredient.objects.filter(pk=ingredient.pk).values(
+            recipe=Exists(Recipe.objects.filter(pk=recipe.pk)),
+            user=Exists(User.objects.filter(username='testuser')),
+            fridge=Exists(Fridge.objects.filter(pk=fridge.pk)),
+            schedule=Exists(Schedule.objects.filter(pk=schedule.pk)),
+        ).first()
+        self.assertIsNotNone(remaining, 'Ingredient should still exist')
+        self.assertTrue(remaining['recipe'], 'Recipe should still exist')
+        self.assertFalse(remaining['user'], 'User should be deleted')
+        self.assertFalse(remaining['fridge'], 'Fridge should be deleted')
+        self.assertFalse(remaining['schedule'], 'Schedule should be deleted')
+
+class FridgeIngredientTests(LoggedInUserMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        """Create a user, an ingredient and the user's fridge once for all tests in the class."""
+        super().setUpTestData()
+
         # Create an Ingredient for testing
-        self.ingredient = Ingredient.objects.create(name='Tomato')
+        cls.ingredient = Ingredient.objects.create(name='Tomato')
 
         # Create a Fridge associated with the test user
-        self.fridge = Fridge.objects.create(user=self.user)
+        cls.fridge = Fridge.objects.create(user=cls.user)
+
+        cls.add_ingredients_url = reverse('add_ingredients_to_fridge')
+        cls.view_fridge_contents_url = reverse('view_fridge_contents')
+        cls.remove_ingredients_url = reverse('remove_ingredients_from_fridge')
 
     def test_add_ingredient_to_fridge_and_calories(self):
         """Test adding an ingredient with calorie information to the fridge."""
-        url = reverse('add_ingredients_to_fridge')
-        data = {'ingredients': [self.ingredient.name]}
-        
-        response = self.client.post(url, json.dumps(data), content_type="application/json")
+        response = self.client.post(self.add_ingredients_url, _TOMATO_INGREDIENTS_BODY, content_type="application/json")
         self.assertEqual(response.status_code, 200)
         self.assertTrue(self.fridge.ingredients.filter(name=self.ingredient.name).exists())
 
@@ -156,8 +204,7 @@ class FridgeIngredientTests(TestCase):
         """Test viewing the ingredients in the fridge."""
         self.fridge.ingredients.add(self.ingredient)
 
-        url = reverse('view_fridge_contents')
-        response = self.client.get(url)
+        response = self.client.get(self.view_fridge_contents_url)
         self.assertEqual(response.status_code, 200)
 
         data = response.json()
@@ -169,46 +216,38 @@ class FridgeIngredientTests(TestCase):
         self.fridge.ingredients.add(self.ingredient, cucumber)
 
         # Remove one ingredient
-        url = reverse('remove_ingredients_from_fridge')
-        data = {'ingredients': [self.ingredient.name]}
-        
-        response = self.client.post(url, json.dumps(data), content_type="application/json")
+        response = self.client.post(self.remove_ingredients_url, _TOMATO_INGREDIENTS_BODY, content_type="application/json")
         self.assertEqual(response.status_code, 200)
         self.assertFalse(self.fridge.ingredients.filter(name=self.ingredient.name).exists()) # Check Tomato is removed
         self.assertTrue(self.fridge.ingredients.filter(name=cucumber.name).exists()) # Check Cucumber is still there
 
         # Test removing all ingredients
-        data = {'ingredients': []}
-        response = self.client.post(url, json.dumps(data), content_type="application/json")
+        response = self.client.post(self.remove_ingredients_url, _NO_INGREDIENTS_BODY, content_type="application/json")
         self.assertEqual(response.status_code, 200)
         self.assertFalse(self.fridge.ingredients.exists())  # The fridge should now be empty
 
 class RecipeTests(TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Create a user for the test and ingredients with calorie information."""
-        self.user = User.objects.create_user(username='testuser', password='password123')
-        self.client.login(username=self.user.username, password='password123')
+        cls.user = User.objects.create(username='testuser')
 
-        # Complete the health profile
-        health_profile_data = {
-            'current_weight': 70,
-            'target_weight': 75,
-            'height': 170,
-            'weekly_physical_activity': 3,
-            'gender': 'male',
-            'dietary_restriction': 'none',
-            'birthday': '1990-01-01'
-        }
-        self.client.post(reverse('signup_follow'), data=health_profile_data, content_type='application/json')
-        
         # Now including calories when creating ingredients
-        self.ingredient1 = Ingredient.objects.create(
-            name='Tomato'
-        )
+        cls.ingredient1, cls.ingredient2 = Ingredient.objects.bulk_create([
+            Ingredient(name='Tomato'),
+            Ingredient(name='Cucumber')
+        ])
 
-        self.ingredient2 = Ingredient.objects.create(
-            name='Cucumber'
-        )
+        cls.signup_follow_url = reverse('signup_follow')
+        cls.recommended_calories_url = reverse('caloric_intake_recommendation')
+        cls.log_meal_url = reverse('log_meal')
+
+    def setUp(self):
+        """Log the test user in and complete their health profile."""
+        self.client.force_login(self.user)
+
+        # Complete the health profile
+        self.client.post(self.signup_follow_url, _HEALTH_PROFILE_BODY, content_type='application/json')
 
     def test_recipe_creation_and_ingredient_association(self):
         """Test creating a recipe and associating it with ingredients including calorie information."""
@@ -224,43 +263,40 @@ class RecipeTests(TestCase):
         self.assertEqual(Recipe.objects.count(), 1)
 
         # Verify the ingredients are associated with the recipe and have correct calorie information
-        self.assertEqual(self.recipe.ingredients.count(), 2)
-        self.assertIn(self.ingredient1, self.recipe.ingredients.all())
-        self.assertIn(self.ingredient2, self.recipe.ingredients.all())
+        ingredients = list(self.recipe.ingredients.all())
+        self.assertEqual(len(ingredients), 2)
+        self.assertIn(self.ingredient1, ingredients)
+        self.assertIn(self.ingredient2, ingredients)
 
     def test_log_meal_success(self):
         """Test successfully logging a meal with all details provided."""
-        recommended_calories_url = reverse('caloric_intake_recommendation')
-        response = self.client.get(recommended_calories_url)
+        response = self.client.get(self.recommended_calories_url)
         
-        data = json.loads(response.content.decode('utf-8'))
+        data = response.json()
         recommended_calories = data['recommended_calories']
         
         meal_calories = int(recommended_calories) / 4
 
-        url = reverse('log_meal')
         meal_data = {
             'breakfast': meal_calories,
             'lunch': meal_calories,
             'dinner': meal_calories,
             'snacks': meal_calories
         }
-        response = self.client.post(url, json.dumps(meal_data), content_type="application/json")
+        response = self.client.post(self.log_meal_url, json.dumps(meal_data), content_type="application/json")
         self.assertEqual(response.status_code, 200)
         self.assertIn('You have met your daily calorie goal', response.json()['calorie_status'])
 
 class ScheduleTests(TestCase):
-    def setUp(self):
-        self.user = User.objects.create_user(username='testuser', password='password123')
-        self.client.login(username=self.user.username, password='password123')
-
-        self.ingredient1 = Ingredient.objects.create(
-            name='Tomato'
-        )
-        self.ingredient2 = Ingredient.objects.create(
-            name='Lettuce'
-        )
-        self.recipe = Recipe.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='testuser')
+
+        cls.ingredient1, cls.ingredient2 = Ingredient.objects.bulk_create([
+            Ingredient(name='Tomato'),
+            Ingredient(name='Lettuce')
+        ])
+        cls.recipe = Recipe.objects.create(
             name='Salad',
             preparation='Chop ingredients and mix.',
             meal_type='Lunch',
@@ -268,8 +304,12 @@ class ScheduleTests(TestCase):
         )
 
         # Add both ingredients to the recipe
-        self.recipe.ingredients.set([self.ingredient1, self.ingredient2])
-        self.recipe.save()
+        cls.recipe.ingredients.set([cls.ingredient1, cls.ingredient2])
+
+        cls.meal_reminder_url = reverse('meal_reminder')
+
+    def setUp(self):
+        self.client.force_login(self.user)
 
     def test_schedule_creation(self):
         schedule_time = timezone.now() + timedelta(days=1)  # Schedule for tomorrow
@@ -279,15 +319,14 @@ class ScheduleTests(TestCase):
             meal_type='Lunch'
         )
         schedule.recipes.add(self.recipe)
-        schedule.save()
 
         # Verify the schedule was created and associated correctly
         self.assertEqual(Schedule.objects.count(), 1)
-        self.assertEqual(schedule.recipes.count(), 1)
-        self.assertIn(self.recipe, schedule.recipes.all())
+        recipes = list(schedule.recipes.prefetch_related('ingredients'))
+        self.assertEqual(recipes, [self.recipe])
         
         # Verify that the recipe ingredients include the expected ingredients with calories
-        recipe_ingredients = list(schedule.recipes.first().ingredients.all())
+        recipe_ingredients = list(recipes[0].ingredients.all())
         self.assertIn(self.ingredient1, recipe_ingredients)
         self.assertIn(self.ingredient2, recipe_ingredients)
 
@@ -303,7 +342,7 @@ class ScheduleTests(TestCase):
         schedule_time = simulated_time + timedelta(minutes=30)
         Schedule.objects.create(user=self.user, date_and_time=schedule_time, meal_type='breakfast')
 
-        response = self.client.get(reverse('meal_reminder'))
+        response = self.client.get(self.meal_reminder_url)
         self.assertEqual(response.status_code, 200)
         self.assertIn('Reminder', response.json()['reminder'])
 
@@ -319,17 +358,17 @@ class ScheduleTests(TestCase):
         schedule_time = simulated_time + timedelta(hours=2)
         Schedule.objects.create(user=self.user, date_and_time=schedule_time, meal_type='lunch')
 
-        response = self.client.get(reverse('meal_reminder'))
+        response = self.client.get(self.meal_reminder_url)
         self.assertEqual(response.status_code, 204)
 
     @patch('NutriPapiApp.views.get_current_time')
     def test_no_meal_scheduled(self, mock_get_current_time):
         """Test not receiving a meal reminder when no meal is scheduled."""
-        self.client.login(username=self.user.username, password='password123')
+        self.client.force_login(self.user)
 
         # Simulate any current time
         simulated_time = timezone.now().replace(hour=10, minute=0, second=0, microsecond=0, tzinfo=pytz.utc)
         mock_get_current_time.return_value = simulated_time
 
-        response = self.client.get(reverse('meal_reminder'))
+        response = self.client.get(self.meal_reminder_url)
         self.assertEqual(response.status_code, 204)
\ No newline at end of file